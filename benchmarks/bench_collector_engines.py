@@ -0,0 +1,103 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import urllib.request
+
+import pandas as pd
+
+from mock_news_server import add_server_arguments, server_arguments, start_mock_server
+
+WIKIPEDIA_OPS_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "wikipedia_ops"
+)
+sys.path.insert(0, WIKIPEDIA_OPS_DIR)
+
+
+class NullProgress:
+    def write(self, *args, **kwargs):
+        pass
+
+    def update(self, *args, **kwargs):
+        pass
+
+    def set_postfix(self, *args, **kwargs):
+        pass
+
+
+def control_request(description, path):
+    with urllib.request.urlopen(description["control"] + path) as response:
+        return json.loads(response.read())
+
+
+def build_sources_df(description):
+    return pd.DataFrame(
+        [
+            {"publisher_name": site["name"], "link": site["url"], "country": "Mock"}
+            for site in description["sites"]
+        ]
+    )
+
+
+def run_engine(collector, engine, sources_df, args):
+    results = []
+    start = time.perf_counter()
+    if engine == "async":
+        collector.run_async_engine(
+            sources_df,
+            NullProgress(),
+            results.append,
+            args.max_in_flight,
+            args.per_host,
+        )
+    else:
+        collector.run_thread_engine(
+            sources_df, NullProgress(), results.append, args.workers
+        )
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the thread and async engines of the source list generator"
+    )
+    add_server_arguments(parser)
+    parser.add_argument("--engines", default="threads,async")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-in-flight", type=int, default=500)
+    parser.add_argument("--per-host", type=int, default=4)
+    args = parser.parse_args()
+
+    # The collector logs to a file in the working directory
+    os.chdir(tempfile.mkdtemp(prefix="collector_bench_"))
+    import collector_engine_source_list_generator as collector
+
+    process, description = start_mock_server(server_arguments(args))
+    try:
+        sources_df = build_sources_df(description)
+        print(
+            f"{'engine':<8} {'sources':>8} {'usable':>7} {'seconds':>8} "
+            f"{'sources/s':>10} {'requests':>9} {'req/s':>8} {'p50 ms':>7} {'p99 ms':>7}"
+        )
+        for engine in args.engines.split(","):
+            control_request(description, "/__reset")
+            results, elapsed = run_engine(collector, engine, sources_df, args)
+            stats = control_request(description, "/__stats")
+            usable = sum(result["usable_source"] for result in results)
+            print(
+                f"{engine:<8} {len(results):>8} {usable:>7} {elapsed:>8.2f} "
+                f"{len(results) / elapsed:>10.1f} {stats['requests']:>9} "
+                f"{stats['requests'] / elapsed:>8.1f} {stats['p50_ms']:>7.1f} "
+                f"{stats['p99_ms']:>7.1f}"
+            )
+        # Connection reuse of the shared transport used by the threads engine
+        collector.http_transport.report_stats()
+    finally:
+        process.terminate()
+        process.wait()
+
+
+if __name__ == "__main__":
+    main()
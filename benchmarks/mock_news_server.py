@@ -0,0 +1,297 @@
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+from aiohttp import web
+
+# Every synthetic site listens on its own port of 127.0.0.1, so each one has a
+# distinct netloc and per-host limits behave like they would on the internet.
+
+HOMEPAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<title>{name}</title>
+{feed_link}
+</head>
+<body>
+<h1>{name}</h1>
+<ul>
+{article_items}
+</ul>
+</body>
+</html>
+"""
+
+ARTICLE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<title>{title}</title>
+<meta name="author" content="{author}">
+<meta property="article:published_time" content="{published}">
+<meta name="keywords" content="news,{name}">
+</head>
+<body>
+<article>
+<h1>{title}</h1>
+<p class="byline">By {author}</p>
+{paragraphs}
+</article>
+</body>
+</html>
+"""
+
+ROBOTS_ALLOW = "User-agent: *\nDisallow: /private/\n"
+ROBOTS_DISALLOW = "User-agent: *\nDisallow: /\n"
+
+
+class MockNewsWeb:
+    def __init__(
+        self,
+        sites=50,
+        feed_entries=20,
+        latency_ms=0,
+        jitter_ms=0,
+        down_rate=0.0,
+        error_rate=0.0,
+        no_feed_link_rate=0.0,
+        disallow_rate=0.0,
+        seed=0,
+    ):
+        self.site_count = sites
+        self.feed_entries = feed_entries
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.sites = {}
+        self.request_count = 0
+        self.latencies = []
+        self.started = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        for site_id in range(sites):
+            self.sites[site_id] = {
+                "name": f"Mock News {site_id}",
+                "is_down": self.random.random() < down_rate,
+                "has_feed_link": self.random.random() >= no_feed_link_rate,
+                "allows_crawling": self.random.random() >= disallow_rate,
+            }
+
+    def site_for(self, request):
+        port = request.transport.get_extra_info("sockname")[1]
+        return self.ports.get(port)
+
+    async def handle(self, request):
+        start = time.perf_counter()
+        self.request_count += 1
+        try:
+            delay = self.latency + self.random.uniform(0, self.jitter)
+            if delay:
+                await asyncio.sleep(delay)
+            return self.route(request)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+    def route(self, request):
+        site_id = self.site_for(request)
+        if site_id is None:
+            raise web.HTTPNotFound()
+        site = self.sites[site_id]
+        if site["is_down"] or self.random.random() < self.error_rate:
+            raise web.HTTPServiceUnavailable()
+
+        path = request.path
+        if path == "/":
+            return self.homepage(site_id, site)
+        if path == "/rss.xml":
+            return self.feed(site_id, request)
+        if path == "/robots.txt":
+            body = ROBOTS_ALLOW if site["allows_crawling"] else ROBOTS_DISALLOW
+            return web.Response(text=body, content_type="text/plain")
+        if path.startswith("/articles/"):
+            return self.article(site_id, site, path)
+        raise web.HTTPNotFound()
+
+    def base_url(self, site_id):
+        return f"http://127.0.0.1:{self.site_ports[site_id]}"
+
+    def homepage(self, site_id, site):
+        feed_link = (
+            '<link rel="alternate" type="application/rss+xml" href="/rss.xml">'
+            if site["has_feed_link"]
+            else ""
+        )
+        article_items = "\n".join(
+            f'<li><a href="/articles/{entry_id}.html">Story {entry_id}</a></li>'
+            for entry_id in range(min(self.feed_entries, 10))
+        )
+        body = HOMEPAGE_TEMPLATE.format(
+            name=site["name"], feed_link=feed_link, article_items=article_items
+        )
+        return web.Response(text=body, content_type="text/html")
+
+    def feed(self, site_id, request):
+        base_url = self.base_url(site_id)
+        items = []
+        for entry_id in range(self.feed_entries):
+            published = format_datetime(self.started - timedelta(hours=entry_id))
+            items.append(
+                "<item>"
+                f"<title>Story {entry_id} from site {site_id}</title>"
+                f"<link>{base_url}/articles/{entry_id}.html</link>"
+                f"<guid>{base_url}/articles/{entry_id}.html</guid>"
+                f"<pubDate>{published}</pubDate>"
+                f"<description>Summary of story {entry_id}</description>"
+                "</item>"
+            )
+        body = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<rss version="2.0"><channel>'
+            f"<title>{self.sites[site_id]['name']}</title>"
+            f"<link>{base_url}/</link>"
+            "<description>Synthetic feed</description>"
+            f"{''.join(items)}"
+            "</channel></rss>"
+        )
+        return web.Response(text=body, content_type="application/rss+xml")
+
+    def article(self, site_id, site, path):
+        entry_id = path.rsplit("/", 1)[-1].split(".")[0]
+        paragraphs = "\n".join(
+            f"<p>Paragraph {paragraph} of story {entry_id} published by "
+            f"{site['name']}. The quick brown fox jumps over the lazy dog.</p>"
+            for paragraph in range(12)
+        )
+        body = ARTICLE_TEMPLATE.format(
+            title=f"Story {entry_id} from site {site_id}",
+            author=f"Reporter {site_id}",
+            published=self.started.isoformat(),
+            name=site["name"],
+            paragraphs=paragraphs,
+        )
+        return web.Response(text=body, content_type="text/html")
+
+    async def stats(self, request):
+        latencies = sorted(self.latencies)
+        return web.json_response(
+            {
+                "requests": self.request_count,
+                "p50_ms": percentile(latencies, 50) * 1000,
+                "p99_ms": percentile(latencies, 99) * 1000,
+            }
+        )
+
+    async def reset(self, request):
+        self.request_count = 0
+        self.latencies = []
+        return web.json_response({"ok": True})
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_route("*", "/__stats", self.stats)
+        app.router.add_route("*", "/__reset", self.reset)
+        app.router.add_route("*", "/{tail:.*}", self.handle)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+
+        control_site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await control_site.start()
+        self.control_port = control_site._server.sockets[0].getsockname()[1]
+
+        self.site_ports = {}
+        self.ports = {}
+        for site_id in self.sites:
+            tcp_site = web.TCPSite(self.runner, "127.0.0.1", 0, backlog=1024)
+            await tcp_site.start()
+            port = tcp_site._server.sockets[0].getsockname()[1]
+            self.site_ports[site_id] = port
+            self.ports[port] = site_id
+
+    def describe(self):
+        return {
+            "control": f"http://127.0.0.1:{self.control_port}",
+            "sites": [
+                {
+                    "url": self.base_url(site_id),
+                    "name": site["name"],
+                    "is_down": site["is_down"],
+                }
+                for site_id, site in self.sites.items()
+            ],
+        }
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    position = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[position]
+
+
+def add_server_arguments(parser):
+    parser.add_argument("--sites", type=int, default=50)
+    parser.add_argument("--feed-entries", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--down-rate", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--no-feed-link-rate", type=float, default=0.0)
+    parser.add_argument("--disallow-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def server_arguments(args):
+    return [
+        f"--sites={args.sites}",
+        f"--feed-entries={args.feed_entries}",
+        f"--latency-ms={args.latency_ms}",
+        f"--jitter-ms={args.jitter_ms}",
+        f"--down-rate={args.down_rate}",
+        f"--error-rate={args.error_rate}",
+        f"--no-feed-link-rate={args.no_feed_link_rate}",
+        f"--disallow-rate={args.disallow_rate}",
+        f"--seed={args.seed}",
+    ]
+
+
+def start_mock_server(arguments):
+    # Runs the server in its own process so it does not compete with the code
+    # under test for the GIL, and returns the process with its site map
+    process = subprocess.Popen(
+        [sys.executable, __file__, *arguments],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    description = json.loads(process.stdout.readline())
+    return process, description
+
+
+async def serve(args):
+    mock_web = MockNewsWeb(
+        sites=args.sites,
+        feed_entries=args.feed_entries,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        down_rate=args.down_rate,
+        error_rate=args.error_rate,
+        no_feed_link_rate=args.no_feed_link_rate,
+        disallow_rate=args.disallow_rate,
+        seed=args.seed,
+    )
+    await mock_web.start()
+    print(json.dumps(mock_web.describe()), flush=True)
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local mock news web for benchmarks")
+    add_server_arguments(parser)
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
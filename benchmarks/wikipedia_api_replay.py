@@ -0,0 +1,97 @@
+import argparse
+import hashlib
+import json
+import os
+from urllib.parse import urlencode
+
+import aiohttp
+from aiohttp import web
+
+# Records MediaWiki and Wikidata API responses to a fixture directory and
+# serves them back locally, so the crawler's api backend can be run offline:
+#
+#   python wikipedia_api_replay.py record fixtures/   # proxies to the live APIs
+#   python wikipedia_api_replay.py serve fixtures/
+#   python wikipedia_link_crawler.py --backend api \
+#       --api-url http://127.0.0.1:8089/enwiki/w/api.php \
+#       --wikidata-api-url http://127.0.0.1:8089/wikidata/w/api.php
+
+UPSTREAMS = {
+    "enwiki": "https://en.wikipedia.org",
+    "wikidata": "https://www.wikidata.org",
+}
+
+
+def fixture_key(wiki, path, query):
+    canonical = f"{wiki}{path}?{urlencode(sorted(query.items()))}"
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def fixture_path(fixtures_dir, wiki, path, query):
+    return os.path.join(fixtures_dir, f"{wiki}-{fixture_key(wiki, path, query)}.json")
+
+
+def split_request_path(request):
+    wiki, _, path = request.path.lstrip("/").partition("/")
+    if wiki not in UPSTREAMS:
+        raise web.HTTPNotFound(text=f"Unknown wiki: {wiki}")
+    return wiki, "/" + path
+
+
+async def replay(request):
+    wiki, path = split_request_path(request)
+    fixture = fixture_path(request.app["fixtures_dir"], wiki, path, dict(request.query))
+    if not os.path.exists(fixture):
+        raise web.HTTPNotFound(text=f"No fixture recorded for {request.path_qs}")
+    with open(fixture, "rb") as f:
+        return web.Response(body=f.read(), content_type="application/json")
+
+
+async def record(request):
+    wiki, path = split_request_path(request)
+    query = dict(request.query)
+    async with request.app["client"].get(UPSTREAMS[wiki] + path, params=query) as response:
+        body = await response.read()
+        status = response.status
+    if status == 200:
+        fixture = fixture_path(request.app["fixtures_dir"], wiki, path, query)
+        with open(fixture, "wb") as f:
+            f.write(body)
+    return web.Response(body=body, status=status, content_type="application/json")
+
+
+async def create_client(app):
+    app["client"] = aiohttp.ClientSession(
+        headers={"User-Agent": "storion-source-collector fixture recorder"}
+    )
+    yield
+    await app["client"].close()
+
+
+def create_app(mode, fixtures_dir):
+    app = web.Application()
+    app["fixtures_dir"] = fixtures_dir
+    if mode == "record":
+        os.makedirs(fixtures_dir, exist_ok=True)
+        app.cleanup_ctx.append(create_client)
+        app.router.add_get("/{tail:.*}", record)
+    else:
+        app.router.add_get("/{tail:.*}", replay)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Record or replay MediaWiki/Wikidata API fixtures"
+    )
+    parser.add_argument("mode", choices=("record", "serve"))
+    parser.add_argument("fixtures_dir")
+    parser.add_argument("--port", type=int, default=8089)
+    args = parser.parse_args()
+    web.run_app(
+        create_app(args.mode, args.fixtures_dir), host="127.0.0.1", port=args.port
+    )
+
+
+if __name__ == "__main__":
+    main()
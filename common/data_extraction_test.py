@@ -8,6 +8,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from threading import Lock
 import sys
 import traceback
+import http_transport
 
 # Initialize colorama
 init()
@@ -57,8 +58,10 @@ def process_article(entry, position, domain):
         return None
 
     try:
+        response = http_transport.get(link)
+        response.raise_for_status()
         article = Article(link)
-        article.download()
+        article.download(input_html=response.text)
         article.parse()
 
         results = {key: 0 for key in counters.keys()}
@@ -95,6 +98,15 @@ def process_article(entry, position, domain):
         return None
 
 
+def fetch_feed(rss_url):
+    response = http_transport.get(rss_url)
+    if response.status_code != 200:
+        return None
+    response_headers = {key.lower(): value for key, value in response.headers.items()}
+    response_headers["content-location"] = response.url
+    return feedparser.parse(response.content, response_headers=response_headers)
+
+
 def process_feed(item, index, position):
     try:
         domain = item.get("domain", "unknown_domain")
@@ -117,12 +129,12 @@ def process_feed(item, index, position):
         }
 
         try:
-            rss_feed = feedparser.parse(rss_url)
+            rss_feed = fetch_feed(rss_url)
         except Exception as e:
             logging.error(f"Feed parsing error for {domain}: {str(e)}")
             return create_error_result(title, domain)
 
-        is_valid_feed = not rss_feed.bozo
+        is_valid_feed = rss_feed is not None and not rss_feed.bozo
         results["valid_feed"] = is_valid_feed
 
         if not is_valid_feed:
@@ -228,6 +240,8 @@ try:
         lambda x: counters["failed_scrapes"].get(x, 0)
     )
 
+    http_transport.report_stats(tqdm.write)
+
     try:
         results_df.to_csv("data_extraction_test_results.csv", index=False)
     except Exception as e:
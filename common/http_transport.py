@@ -0,0 +1,202 @@
+import logging
+import threading
+import time
+from collections import Counter
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+# Shared HTTP transport for the collector scripts. Every script goes through one
+# requests.Session whose adapter keeps a pool of keep-alive connections per
+# host, retries transient failures with backoff and applies a default timeout.
+
+DEFAULT_TIMEOUT = 5
+DEFAULT_POOL_CONNECTIONS = 200  # Number of per-host pools kept alive
+DEFAULT_POOL_MAXSIZE = 10  # Connections kept alive per host
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+USER_AGENT = "Mozilla/5.0 (compatible; storion-source-collector)"
+
+
+class TransportStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = Counter()
+
+    def record_request(self):
+        with self.lock:
+            self.requests += 1
+
+    def record_new_connection(self, host):
+        with self.lock:
+            self.new_connections[host] += 1
+
+    def snapshot(self):
+        with self.lock:
+            new_connections = sum(self.new_connections.values())
+            return {
+                "requests": self.requests,
+                "new_connections": new_connections,
+                "reused_connections": max(self.requests - new_connections, 0),
+                "hosts": len(self.new_connections),
+            }
+
+
+stats = TransportStats()
+
+
+class CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self):
+        stats.record_new_connection(f"{self.host}:{self.port}")
+        return super()._new_conn()
+
+
+class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        stats.record_new_connection(f"{self.host}:{self.port}")
+        return super()._new_conn()
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    def __init__(self, timeout=DEFAULT_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": CountingHTTPConnectionPool,
+            "https": CountingHTTPSConnectionPool,
+        }
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        stats.record_request()
+        return super().send(request, **kwargs)
+
+
+class RateLimiter:
+    # Spaces calls to wait() at least 1 / rate seconds apart across all threads
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self.lock = threading.Lock()
+        self.next_slot = time.monotonic()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def create_session(
+    pool_connections=DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize=DEFAULT_POOL_MAXSIZE,
+    retries=DEFAULT_RETRIES,
+    backoff_factor=DEFAULT_BACKOFF_FACTOR,
+    timeout=DEFAULT_TIMEOUT,
+):
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=("HEAD", "GET"),
+        raise_on_status=False,
+    )
+    adapter = PooledHTTPAdapter(
+        timeout=timeout,
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def configure(**kwargs):
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = create_session(**kwargs)
+    return _session
+
+
+def get_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def get(url, **kwargs):
+    return get_session().get(url, **kwargs)
+
+
+def head(url, **kwargs):
+    return get_session().head(url, **kwargs)
+
+
+def add_transport_arguments(parser):
+    group = parser.add_argument_group("HTTP transport")
+    group.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT)
+    group.add_argument(
+        "--pool-size",
+        type=int,
+        default=DEFAULT_POOL_MAXSIZE,
+        help="Keep-alive connections per host",
+    )
+    group.add_argument(
+        "--pool-hosts",
+        type=int,
+        default=DEFAULT_POOL_CONNECTIONS,
+        help="Number of per-host connection pools to keep",
+    )
+    group.add_argument("--retries", type=int, default=DEFAULT_RETRIES)
+    group.add_argument("--backoff", type=float, default=DEFAULT_BACKOFF_FACTOR)
+
+
+def configure_from_args(args):
+    return configure(
+        pool_connections=args.pool_hosts,
+        pool_maxsize=args.pool_size,
+        retries=args.retries,
+        backoff_factor=args.backoff,
+        timeout=args.timeout,
+    )
+
+
+def report_stats(write=print):
+    snapshot = stats.snapshot()
+    reuse_ratio = (
+        snapshot["reused_connections"] / snapshot["requests"]
+        if snapshot["requests"]
+        else 0
+    )
+    message = (
+        f"HTTP requests: {snapshot['requests']} | "
+        f"New connections: {snapshot['new_connections']} | "
+        f"Reused connections: {snapshot['reused_connections']} ({reuse_ratio:.2%}) | "
+        f"Hosts: {snapshot['hosts']}"
+    )
+    write(message)
+    logging.info(message)
+    return snapshot
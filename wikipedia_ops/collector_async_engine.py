@@ -0,0 +1,247 @@
+import asyncio
+import logging
+from urllib.parse import urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+
+import aiohttp
+import feedparser
+from bs4 import BeautifulSoup
+from feedfinder2 import FeedFinder, coerce_url, sort_urls
+
+FEED_LINK_TYPES = (
+    "application/rss+xml",
+    "text/xml",
+    "application/atom+xml",
+    "application/x.atom+xml",
+    "application/x-atom+xml",
+)
+GUESSED_FEED_PATHS = (
+    "atom.xml",
+    "index.atom",
+    "index.rdf",
+    "rss.xml",
+    "index.xml",
+    "index.rss",
+)
+
+
+class FetchResult:
+    def __init__(self, url, status, headers, body):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    @property
+    def text(self):
+        charset = "utf-8"
+        content_type = self.headers.get("Content-Type", "")
+        if "charset=" in content_type:
+            charset = content_type.split("charset=")[-1].split(";")[0].strip()
+        try:
+            return self.body.decode(charset, errors="replace")
+        except LookupError:
+            return self.body.decode("utf-8", errors="replace")
+
+
+# Runs the source checks of the collector on one shared aiohttp session.
+# max_in_flight caps the requests in flight across all hosts and per_host caps
+# the concurrent connections to a single host; connections are pooled and kept
+# alive by the shared connector.
+class AsyncSourceChecker:
+    def __init__(self, max_in_flight=500, per_host=4, timeout=5):
+        self.max_in_flight = max_in_flight
+        self.per_host = per_host
+        self.timeout = timeout
+        self.feed_finder = FeedFinder()
+        self.session = None
+        self.in_flight = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(
+            limit=self.max_in_flight,
+            limit_per_host=self.per_host,
+            ttl_dns_cache=300,
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={"User-Agent": self.feed_finder.user_agent},
+        )
+        self.in_flight = asyncio.Semaphore(self.max_in_flight)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+
+    async def fetch(self, url, method="GET"):
+        async with self.in_flight:
+            try:
+                async with self.session.request(
+                    method, url, allow_redirects=True
+                ) as response:
+                    body = await response.read() if method == "GET" else b""
+                    return FetchResult(
+                        str(response.url), response.status, response.headers, body
+                    )
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                return None
+
+    async def validate_url(self, url):
+        response = await self.fetch(url, method="HEAD")
+        return response is not None and response.status == 200
+
+    async def is_feed(self, url):
+        response = await self.fetch(url)
+        if response is None:
+            return False
+        return bool(self.feed_finder.is_feed_data(response.text))
+
+    async def filter_feeds(self, urls):
+        checks = await asyncio.gather(*(self.is_feed(url) for url in urls))
+        return [url for url, is_feed in zip(urls, checks) if is_feed]
+
+    async def find_feeds(self, url):
+        # Same search order as feedfinder2.find_feeds, with the candidate
+        # checks of each step running concurrently
+        url = coerce_url(url)
+        response = await self.fetch(url)
+        if response is None:
+            return []
+        text = response.text
+        if self.feed_finder.is_feed_data(text):
+            return [url]
+
+        tree = BeautifulSoup(text, "lxml")
+        links = [
+            urljoin(url, link.get("href", ""))
+            for link in tree.find_all("link")
+            if link.get("type") in FEED_LINK_TYPES
+        ]
+        urls = await self.filter_feeds(links)
+        if urls:
+            return sort_urls(urls)
+
+        local, remote = [], []
+        for a in tree.find_all("a"):
+            href = a.get("href", None)
+            if href is None:
+                continue
+            if "://" not in href and self.feed_finder.is_feed_url(href):
+                local.append(href)
+            if self.feed_finder.is_feedlike_url(href):
+                remote.append(href)
+
+        urls = await self.filter_feeds([urljoin(url, href) for href in local])
+        if urls:
+            return sort_urls(urls)
+
+        urls = await self.filter_feeds([urljoin(url, href) for href in remote])
+        if urls:
+            return sort_urls(urls)
+
+        urls = await self.filter_feeds(
+            [urljoin(url, path) for path in GUESSED_FEED_PATHS]
+        )
+        return sort_urls(urls)
+
+    async def fetch_feed(self, feed_url):
+        response = await self.fetch(feed_url)
+        if response is None or response.status != 200:
+            return None
+        response_headers = {
+            key.lower(): value for key, value in response.headers.items()
+        }
+        response_headers["content-location"] = response.url
+        return feedparser.parse(response.body, response_headers=response_headers)
+
+    async def find_rss_feed(self, domain, scheme="https"):
+        for feed_url in await self.find_feeds(f"{scheme}://{domain}"):
+            feed = await self.fetch_feed(feed_url)
+            if feed is not None and feed.bozo == 0:
+                return feed_url, feed
+        return None, None
+
+    async def check_robots_txt(self, domain, article_links, scheme="https"):
+        robots_url = f"{scheme}://{domain}/robots.txt"
+        response = await self.fetch(robots_url)
+        if response is None:
+            logging.error(f"Failed to fetch {robots_url}")
+            return False, 0
+
+        # Mirror RobotFileParser.read() handling of error statuses
+        rp = RobotFileParser(robots_url)
+        if response.status in (401, 403):
+            rp.disallow_all = True
+        elif response.status >= 400:
+            rp.allow_all = True
+        else:
+            rp.parse(response.text.splitlines())
+
+        allowed_count = sum(1 for link in article_links if rp.can_fetch("*", link))
+        return True, allowed_count / len(article_links)
+
+    async def check_source(self, link):
+        parsed_link = urlparse(link)
+        domain = parsed_link.netloc if link else ""
+        scheme = parsed_link.scheme or "https"
+
+        is_domain_up = await self.validate_url(link) if domain else False
+        rss_url, feed = (
+            await self.find_rss_feed(domain, scheme) if is_domain_up else (None, None)
+        )
+        is_rss_feed_available = rss_url is not None
+        is_rss_feed_valid = is_rss_feed_available and feed.bozo == 0
+
+        article_links = (
+            [entry.link for entry in feed.entries if entry.get("link")]
+            if is_rss_feed_valid
+            else []
+        )
+
+        is_scraping_allowed, scraping_score = (
+            await self.check_robots_txt(domain, article_links, scheme)
+            if article_links
+            else (False, 0)
+        )
+
+        return {
+            "domain": domain,
+            "rss_url": rss_url,
+            "is_scraping_allowed": is_scraping_allowed,
+            "is_domain_up": is_domain_up,
+            "is_rss_feed_available": is_rss_feed_available,
+            "is_rss_feed_valid": is_rss_feed_valid,
+        }
+
+
+# A fixed set of worker tasks pulls (index, row) pairs from a bounded queue, so
+# memory stays flat regardless of how many sources are queued.
+async def check_sources_async(
+    rows, on_checked, max_in_flight=500, per_host=4, timeout=5
+):
+    queue = asyncio.Queue(maxsize=max_in_flight * 2)
+
+    async with AsyncSourceChecker(max_in_flight, per_host, timeout) as checker:
+
+        async def worker():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    queue.task_done()
+                    return
+                index, row = item
+                try:
+                    checks = await checker.check_source(str(row["link"]))
+                    on_checked(index, row, checks)
+                except Exception as ex:
+                    logging.exception(f"Unknown error: {ex}")
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(max_in_flight)]
+        for item in rows:
+            await queue.put(item)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
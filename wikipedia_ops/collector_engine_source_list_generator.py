@@ -1,3 +1,7 @@
+import argparse
+import asyncio
+import os
+import sys
 import pandas as pd
 import requests
 from urllib.parse import urlparse
@@ -10,6 +14,9 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 from feedfinder2 import find_feeds  # Added import
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+import http_transport
+
 # Configure logging
 logging.basicConfig(
     filename="source_list_collector.log",
@@ -17,23 +24,17 @@ logging.basicConfig(
     format="%(asctime)s - %(message)s",
 )
 
-# Load the CSV file
-sources_df = pd.read_csv("news_websites_modded.csv")
-
-# Initialize the DataFrame to store results
-results_df = pd.DataFrame(
-    columns=[
-        "source_name",
-        "domain",
-        "country",
-        "rss_url",
-        "usable_source",
-        "is_scraping_allowed",
-        "is_domain_up",
-        "is_rss_feed_available",
-        "is_rss_feed_valid",
-    ]
-)
+RESULT_COLUMNS = [
+    "source_name",
+    "domain",
+    "country",
+    "rss_url",
+    "usable_source",
+    "is_scraping_allowed",
+    "is_domain_up",
+    "is_rss_feed_available",
+    "is_rss_feed_valid",
+]
 
 # Lock for thread-safe logging
 log_lock = threading.Lock()
@@ -41,31 +42,45 @@ log_lock = threading.Lock()
 
 def validate_url(url):
     try:
-        response = requests.head(url, allow_redirects=True, timeout=5)
+        response = http_transport.head(url, allow_redirects=True)
         return response.status_code == 200
     except requests.RequestException:
         return False
 
 
-def find_rss_feed(domain):
-    potential_feeds = find_feeds(f"https://{domain}")
+def fetch_feed(feed_url):
+    # Download the feed once and parse the bytes in memory, so that the
+    # validity check, link extraction and robots check share one result
+    try:
+        response = http_transport.get(feed_url)
+    except requests.RequestException:
+        return None
+    if response.status_code != 200:
+        return None
+    response_headers = {key.lower(): value for key, value in response.headers.items()}
+    response_headers["content-location"] = response.url
+    return feedparser.parse(response.content, response_headers=response_headers)
+
+
+def find_rss_feed(domain, scheme="https"):
+    potential_feeds = find_feeds(f"{scheme}://{domain}")
     for feed_url in potential_feeds:
-        try:
-            response = requests.get(feed_url, timeout=5)
-            if response.status_code == 200 and feedparser.parse(feed_url).bozo == 0:
-                return feed_url
-        except requests.RequestException as ex:
-            continue
-    return None
+        feed = fetch_feed(feed_url)
+        if feed is not None and check_feed_validity(feed):
+            return feed_url, feed
+    return None, None
 
 
-def check_feed_validity(feed_url):
-    feed = feedparser.parse(feed_url)
-    return feed.bozo == 0
+def check_feed_validity(feed):
+    return feed is not None and feed.bozo == 0
 
 
-def check_robots_txt(domain, article_links):
-    robots_url = f"https://{domain}/robots.txt"
+def get_article_links(feed):
+    return [entry.link for entry in feed.entries if entry.get("link")]
+
+
+def check_robots_txt(domain, article_links, scheme="https"):
+    robots_url = f"{scheme}://{domain}/robots.txt"
     rp = RobotFileParser()
     rp.set_url(robots_url)
     try:
@@ -83,39 +98,58 @@ def check_robots_txt(domain, article_links):
         return False, 0
 
 
-def process_source(index, row, pbar):
-    source_name = row["publisher_name"]
-    country = row["country"]
-    link = str(row["link"])  # Ensure link is a string
-    domain = urlparse(link).netloc if link else ""
+def check_source(link):
+    parsed_link = urlparse(link)
+    domain = parsed_link.netloc if link else ""
+    scheme = parsed_link.scheme or "https"
 
     is_domain_up = validate_url(link) if domain else False
-    rss_url = find_rss_feed(domain) if is_domain_up else None
+    rss_url, feed = find_rss_feed(domain, scheme) if is_domain_up else (None, None)
     is_rss_feed_available = rss_url is not None
-    is_rss_feed_valid = check_feed_validity(rss_url) if is_rss_feed_available else False
+    is_rss_feed_valid = check_feed_validity(feed) if is_rss_feed_available else False
 
-    article_links = []
-    if is_rss_feed_valid:
-        feed = feedparser.parse(rss_url)
-        article_links = [entry.link for entry in feed.entries]
+    article_links = get_article_links(feed) if is_rss_feed_valid else []
 
     is_scraping_allowed, scraping_score = (
-        check_robots_txt(domain, article_links) if article_links else (False, 0)
+        check_robots_txt(domain, article_links, scheme) if article_links else (False, 0)
     )
-    usable_source = is_domain_up and is_rss_feed_valid and is_scraping_allowed
 
-    result = {
-        "source_name": source_name,
+    return {
         "domain": domain,
-        "country": country,
         "rss_url": rss_url,
-        "usable_source": usable_source,
         "is_scraping_allowed": is_scraping_allowed,
         "is_domain_up": is_domain_up,
         "is_rss_feed_available": is_rss_feed_available,
         "is_rss_feed_valid": is_rss_feed_valid,
     }
 
+
+def build_result(row, checks):
+    usable_source = (
+        checks["is_domain_up"]
+        and checks["is_rss_feed_valid"]
+        and checks["is_scraping_allowed"]
+    )
+    return {
+        "source_name": row["publisher_name"],
+        "domain": checks["domain"],
+        "country": row["country"],
+        "rss_url": checks["rss_url"],
+        "usable_source": usable_source,
+        "is_scraping_allowed": checks["is_scraping_allowed"],
+        "is_domain_up": checks["is_domain_up"],
+        "is_rss_feed_available": checks["is_rss_feed_available"],
+        "is_rss_feed_valid": checks["is_rss_feed_valid"],
+    }
+
+
+def report_result(index, result, pbar):
+    source_name = result["source_name"]
+    usable_source = result["usable_source"]
+    is_domain_up = result["is_domain_up"]
+    is_rss_feed_available = result["is_rss_feed_available"]
+    is_scraping_allowed = result["is_scraping_allowed"]
+
     # Thread-safe logging
     with log_lock:
         pbar.write(
@@ -127,39 +161,121 @@ def process_source(index, row, pbar):
         pbar.update(1)
         pbar.set_postfix({"Current": index + 1})
 
+
+def process_source(index, row, pbar):
+    link = str(row["link"])  # Ensure link is a string
+    result = build_result(row, check_source(link))
+    report_result(index, result, pbar)
     return result
 
 
+def run_thread_engine(sources_df, pbar, on_result, max_workers=None):
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = []
+        for index, row in sources_df.iterrows():
+            futures.append(executor.submit(process_source, index, row, pbar))
+
+        for future in as_completed(futures):
+            on_result(future.result())
+
+
+def run_async_engine(
+    sources_df, pbar, on_result, max_in_flight, per_host, timeout=http_transport.DEFAULT_TIMEOUT
+):
+    # Imported lazily so the thread engine does not require aiohttp
+    from collector_async_engine import check_sources_async
+
+    def on_checked(index, row, checks):
+        result = build_result(row, checks)
+        report_result(index, result, pbar)
+        on_result(result)
+
+    asyncio.run(
+        check_sources_async(
+            sources_df.iterrows(),
+            on_checked,
+            max_in_flight=max_in_flight,
+            per_host=per_host,
+            timeout=timeout,
+        )
+    )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Check news sources for a usable RSS feed and crawl permission."
+    )
+    parser.add_argument("--input", default="news_websites_modded.csv")
+    parser.add_argument("--output", default="processed_sources.csv")
+    parser.add_argument("--engine", choices=("threads", "async"), default="threads")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Thread pool size for the threads engine",
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=500,
+        help="Global cap on concurrent requests for the async engine",
+    )
+    parser.add_argument(
+        "--per-host",
+        type=int,
+        default=4,
+        help="Cap on concurrent connections per host for the async engine",
+    )
+    http_transport.add_transport_arguments(parser)
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+    http_transport.configure_from_args(args)
+
+    # Load the CSV file
+    sources_df = pd.read_csv(args.input)
+
+    # Initialize the DataFrame to store results
+    results_df = pd.DataFrame(columns=RESULT_COLUMNS)
+
     total_source_count = sources_df.shape[0]
     usable_source_count = 0
 
+    def collect_result(result):
+        nonlocal usable_source_count
+        results_df.loc[len(results_df)] = result
+        usable_source_count += result["usable_source"]
+        logging.info(
+            f"Processed {result['source_name']} - Usable: {result['usable_source']}"
+        )
+
     # Initialize progress bar
     with tqdm(
         total=total_source_count, desc="Processing sources", colour="#903bf8"
     ) as pbar:
-        with ThreadPoolExecutor() as executor:
-            futures = []
-            for index, row in sources_df.iterrows():
-                futures.append(executor.submit(process_source, index, row, pbar))
-
-            # Collect results and update the dataframe
-            for future in as_completed(futures):
-                result = future.result()
-                results_df.loc[len(results_df)] = result
-                usable_source_count += result["usable_source"]
-                logging.info(
-                    f"Processed {result['source_name']} - Usable: {result['usable_source']}"
-                )
+        if args.engine == "async":
+            run_async_engine(
+                sources_df,
+                pbar,
+                collect_result,
+                args.max_in_flight,
+                args.per_host,
+                args.timeout,
+            )
+        else:
+            run_thread_engine(sources_df, pbar, collect_result, args.workers)
 
     print(f"Total sources: {total_source_count}")
     print(f"Usable sources: {usable_source_count}")
     print(
         f"Percentage of usable sources: {usable_source_count / total_source_count:.2%}"
     )
+    http_transport.report_stats()
 
     # Export results to CSV
-    results_df.to_csv("processed_sources.csv", index=False)
+    results_df.to_csv(args.output, index=False)
 
 
 if __name__ == "__main__":
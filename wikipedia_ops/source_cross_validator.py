@@ -1,9 +1,14 @@
+import os
+import sys
 import pandas as pd
 import requests
 from urllib.parse import urlparse
 from tqdm import tqdm
 import logging
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+import http_transport
+
 # Configure logging
 logging.basicConfig(
     filename="site_validation.log",
@@ -46,7 +51,7 @@ logging.info(f"Number of common sources: {num_common_sources}")
 # Validate the URLs by checking if they are accessible
 def validate_url(url):
     try:
-        response = requests.head(url, allow_redirects=True, timeout=5)
+        response = http_transport.head(url, allow_redirects=True)
         return response.status_code == 200
     except requests.RequestException:
         return False
@@ -79,3 +84,5 @@ logging.info("Error examples: ")
 for status_code, source in error_examples.items():
     print(f"  {status_code}: {source}")
     logging.info(f"  {status_code}: {source}")
+
+http_transport.report_stats()
@@ -0,0 +1,130 @@
+# Client for the MediaWiki action API and the Wikidata API, used by the
+# crawler's "api" backend in place of scraping rendered category and article
+# pages.
+
+MEDIAWIKI_API_URL = "https://en.wikipedia.org/w/api.php"
+WIKIDATA_API_URL = "https://www.wikidata.org/w/api.php"
+API_BATCH_SIZE = 50  # Maximum titles or ids per request for regular clients
+OFFICIAL_WEBSITE_PROPERTY = "P856"
+
+
+def batched(items, size=API_BATCH_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+class MediaWikiAPI:
+    def __init__(
+        self, fetch, api_url=MEDIAWIKI_API_URL, wikidata_api_url=WIKIDATA_API_URL
+    ):
+        # fetch(url, params) performs one GET and returns the response
+        self.fetch = fetch
+        self.api_url = api_url
+        self.wikidata_api_url = wikidata_api_url
+
+    def request(self, api_url, params):
+        response = self.fetch(
+            api_url, params={**params, "format": "json", "formatversion": 2}
+        )
+        response.raise_for_status()
+        data = response.json()
+        if "error" in data:
+            raise RuntimeError(f"API error: {data['error'].get('info', data['error'])}")
+        return data
+
+    def query(self, params):
+        # Yields every result page, following the continuation parameters
+        params = {"action": "query", **params}
+        while True:
+            data = self.request(self.api_url, params)
+            yield data.get("query", {})
+            if "continue" not in data:
+                return
+            params = {**params, **data["continue"]}
+
+    def category_members(self, category_title, member_type="page"):
+        members = []
+        for result in self.query(
+            {
+                "list": "categorymembers",
+                "cmtitle": category_title,
+                "cmtype": member_type,
+                "cmprop": "title|type",
+                "cmlimit": "max",
+            }
+        ):
+            members.extend(result.get("categorymembers", []))
+        # Category pages list subcategories before pages, each in sortkey order
+        members.sort(key=lambda member: member.get("type") != "subcat")
+        return [(member["title"], member.get("type", "page")) for member in members]
+
+    def wikidata_ids(self, titles):
+        ids = {}
+        for batch in batched(titles):
+            for result in self.query(
+                {
+                    "titles": "|".join(batch),
+                    "prop": "pageprops",
+                    "ppprop": "wikibase_item",
+                    "redirects": 1,
+                }
+            ):
+                normalized = {
+                    mapping["from"]: mapping["to"]
+                    for mapping in result.get("normalized", [])
+                }
+                redirects = {
+                    mapping["from"]: mapping["to"]
+                    for mapping in result.get("redirects", [])
+                }
+                pages = {
+                    page["title"]: page.get("pageprops", {}).get("wikibase_item")
+                    for page in result.get("pages", [])
+                }
+                for title in batch:
+                    target = normalized.get(title, title)
+                    target = redirects.get(target, target)
+                    if pages.get(target):
+                        ids[title] = pages[target]
+        return ids
+
+    def official_websites(self, titles):
+        wikidata_ids = self.wikidata_ids(titles)
+        websites = {}
+        entity_ids = sorted(set(wikidata_ids.values()))
+        for batch in batched(entity_ids):
+            data = self.request(
+                self.wikidata_api_url,
+                {
+                    "action": "wbgetentities",
+                    "ids": "|".join(batch),
+                    "props": "claims",
+                },
+            )
+            for entity_id, entity in data.get("entities", {}).items():
+                website = get_claim_value(entity, OFFICIAL_WEBSITE_PROPERTY)
+                if website:
+                    websites[entity_id] = website
+        return {
+            title: websites[entity_id]
+            for title, entity_id in wikidata_ids.items()
+            if entity_id in websites
+        }
+
+
+def get_claim_value(entity, property_id):
+    claims = [
+        claim
+        for claim in entity.get("claims", {}).get(property_id, [])
+        if claim.get("rank") != "deprecated"
+    ]
+    claims.sort(key=lambda claim: claim.get("rank") != "preferred")
+    for claim in claims:
+        value = claim.get("mainsnak", {}).get("datavalue", {}).get("value")
+        if value:
+            return value
+    return None
+
+
+def strip_namespace(title):
+    return title.split(":", 1)[1] if title.startswith("Category:") else title
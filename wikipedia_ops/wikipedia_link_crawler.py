@@ -1,12 +1,25 @@
 from lxml import html
-import requests
+import argparse
 import csv
+import os
+import sys
 import time
 import pickle
+import requests
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+import http_transport
+import wikipedia_api
 
 wikipedia_main_page = "https://en.wikipedia.org/wiki/Category:News_websites_by_country"
+wikipedia_main_category = "Category:News websites by country"
 wikipedia_domain = "https://en.wikipedia.org"
-csvfile = open("news_websites(wikipedia).csv", "w", encoding="utf-8")
+output_file = "news_websites(wikipedia).csv"
+
+DEFAULT_WORKERS = 8
+DEFAULT_REQUEST_RATE = 10  # Requests per second toward Wikipedia, across all workers
+request_limiter = http_transport.RateLimiter(DEFAULT_REQUEST_RATE)
 
 
 def update_progress_bar(progress, total, msg=""):
@@ -50,9 +63,14 @@ def remove_duplicates_of_list(lst):
     return lst
 
 
+def fetch_page(url, params=None):
+    request_limiter.wait()
+    return http_transport.get(url, params=params)
+
+
 def get_country_links():
     print_inline_log("Fetching country links from Wikipedia...", checkbox=True)
-    response = requests.get(wikipedia_main_page)
+    response = fetch_page(wikipedia_main_page)
     if response.status_code != 200:
         print_error(f"Failed to retrieve the main page: {response.status_code}")
         return []
@@ -71,13 +89,16 @@ def get_country_links():
     return country_sites.items()
 
 
-def get_news_website_links(country_name, country_link, writer):
-    print_log(f"Fetching news websites for {country_name}...")
+def get_news_website_list(country_name, country_link):
     param_names = ("website", "url", "site", "link", "domain", "web")
-    response = requests.get(country_link)
+    try:
+        response = fetch_page(country_link)
+    except requests.RequestException as e:
+        print_error(f"Failed to retrieve {country_name} links: {e}")
+        return None
     if response.status_code != 200:
         print_error(f"Failed to retrieve {country_name} links: {response.status_code}")
-        return
+        return None
 
     tree = html.fromstring(response.text)
     news_website_names = tree.xpath('//div[@class="mw-category-group"]//a/text()')
@@ -96,52 +117,198 @@ def get_news_website_links(country_name, country_link, writer):
         # Serialize the variables
         with open(f"news_website_data({country_name.lower()}).pkl", "wb") as f:
             pickle.dump((news_website_names, news_website_links), f)
-        return
-
-    total = len(news_website_links)
-    for i, link in enumerate(news_website_links):
-        response = requests.get(link)
-        tree = html.fromstring(response.text)
-        website_link = tree.xpath(
-            '//td[contains(concat(" ", normalize-space(@class), " "), " infobox-data ")]//a[contains(@href, "http")]/@href'
-        )
-        if len(website_link) == 0:
-            website_link = tree.xpath("//a[text()='Official Website']/@href")
-            website_link = website_link[0] if len(website_link) > 0 else "N/A"
-        else:
-            website_link = website_link[-1]
-        writer.write(
-            f"{news_website_names[i].encode('utf-8').decode('utf-8')},{website_link.encode('utf-8').decode('utf-8')},{country_name.encode('utf-8').decode('utf-8')}\n"
-        )
-        update_progress_bar(
-            i + 1, total, msg=f"Fetching {country_name} news websites..."
-        )
+        return None
+
+    return list(zip(news_website_names, news_website_links))
 
 
-def get_news_website_links_from_all_countries():
-    global csvfile
+def get_official_website_link(link):
+    try:
+        response = fetch_page(link)
+    except requests.RequestException as e:
+        print_error(f"Failed to retrieve {link}: {e}")
+        return "N/A"
+    tree = html.fromstring(response.text)
+    website_link = tree.xpath(
+        '//td[contains(concat(" ", normalize-space(@class), " "), " infobox-data ")]//a[contains(@href, "http")]/@href'
+    )
+    if len(website_link) == 0:
+        website_link = tree.xpath("//a[text()='Official Website']/@href")
+        website_link = website_link[0] if len(website_link) > 0 else "N/A"
+    else:
+        website_link = website_link[-1]
+    return website_link
+
+
+def format_row(name, website_link, country_name):
+    return f"{name.encode('utf-8').decode('utf-8')},{website_link.encode('utf-8').decode('utf-8')},{country_name.encode('utf-8').decode('utf-8')}\n"
+
+
+def get_news_website_links_from_all_countries(writer, workers=DEFAULT_WORKERS):
     print_log("Starting the collection of news website links from all countries...")
-    country_links = get_country_links()
+    country_links = list(get_country_links())
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Country pages and article pages share one bounded pool. Article pages
+        # listed under several countries are only fetched once.
+        country_pages = executor.map(
+            lambda item: get_news_website_list(*item), country_links
+        )
+        article_futures = {}
+        countries = []
+        for (country_name, country_link), news_websites in zip(
+            country_links, country_pages
+        ):
+            if news_websites is None:
+                continue
+            futures = []
+            for name, link in news_websites:
+                if link not in article_futures:
+                    article_futures[link] = executor.submit(
+                        get_official_website_link, link
+                    )
+                futures.append((name, article_futures[link]))
+            countries.append((country_name, futures))
 
-    for country_name, country_link in country_links:
-        get_news_website_links(country_name, country_link, csvfile)
+        # Write in country and category order as results become available
+        written_rows = set()
+        for country_name, futures in countries:
+            print_log(f"Fetching news websites for {country_name}...")
+            total = len(futures)
+            for i, (name, future) in enumerate(futures):
+                row = (name, future.result(), country_name)
+                if row not in written_rows:
+                    written_rows.add(row)
+                    writer.write(format_row(*row))
+                update_progress_bar(
+                    i + 1, total, msg=f"Fetching {country_name} news websites..."
+                )
 
     print_log(
         "Finished collecting news websites.", checkbox=True
     )  # Clear line after overwriting
 
 
+def get_category_members(api, category_title, member_type):
+    try:
+        return api.category_members(category_title, member_type)
+    except (requests.RequestException, RuntimeError) as e:
+        print_error(f"Failed to retrieve members of {category_title}: {e}")
+        return []
+
+
+def get_official_websites(api, titles):
+    try:
+        return api.official_websites(titles)
+    except (requests.RequestException, RuntimeError) as e:
+        print_error(f"Failed to retrieve official websites: {e}")
+        return {}
+
+
+def get_news_website_links_from_api(
+    writer,
+    workers=DEFAULT_WORKERS,
+    api_url=wikipedia_api.MEDIAWIKI_API_URL,
+    wikidata_api_url=wikipedia_api.WIKIDATA_API_URL,
+):
+    print_log("Starting the collection of news website links from the MediaWiki API...")
+    api = wikipedia_api.MediaWikiAPI(fetch_page, api_url, wikidata_api_url)
+
+    print_inline_log("Fetching country categories from Wikipedia...", checkbox=True)
+    countries = get_category_members(api, wikipedia_main_category, "subcat")
+    print_log(
+        f"Retrieved {len(countries)} country links.               ", checkbox=True
+    )
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        country_members = list(
+            executor.map(
+                lambda country: get_category_members(api, country[0], "subcat|page"),
+                countries,
+            )
+        )
+        # Official websites are looked up in batches of up to 50 titles
+        titles = list(
+            dict.fromkeys(title for members in country_members for title, _ in members)
+        )
+        websites = {}
+        batches = list(wikipedia_api.batched(titles))
+        for i, batch_websites in enumerate(
+            executor.map(lambda batch: get_official_websites(api, batch), batches)
+        ):
+            websites.update(batch_websites)
+            update_progress_bar(
+                i + 1, len(batches), msg="Fetching official websites..."
+            )
+
+    written_rows = set()
+    for (country_title, _), members in zip(countries, country_members):
+        country_name = wikipedia_api.strip_namespace(country_title)
+        for title, _ in members:
+            row = (
+                wikipedia_api.strip_namespace(title),
+                websites.get(title, "N/A"),
+                country_name,
+            )
+            if row not in written_rows:
+                written_rows.add(row)
+                writer.write(format_row(*row))
+
+    print_log(
+        "Finished collecting news websites.", checkbox=True
+    )  # Clear line after overwriting
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Collect news websites by country from Wikipedia."
+    )
+    parser.add_argument("--output", default=output_file)
+    parser.add_argument(
+        "--backend",
+        choices=("html", "api"),
+        default="html",
+        help="Scrape rendered pages or query the MediaWiki and Wikidata APIs",
+    )
+    parser.add_argument("--api-url", default=wikipedia_api.MEDIAWIKI_API_URL)
+    parser.add_argument("--wikidata-api-url", default=wikipedia_api.WIKIDATA_API_URL)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Number of pages fetched concurrently",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=DEFAULT_REQUEST_RATE,
+        help="Maximum requests per second toward Wikipedia (0 disables the limit)",
+    )
+    http_transport.add_transport_arguments(parser)
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
+    args = parse_args()
+    http_transport.configure_from_args(args)
+    request_limiter = http_transport.RateLimiter(args.rate)
+    csvfile = open(args.output, "w", encoding="utf-8")
     try:
         start_time = time.time()  # Start timer
         csvfile.write("Name,Link,Country\n")
-        get_news_website_links_from_all_countries()
+        if args.backend == "api":
+            get_news_website_links_from_api(
+                csvfile, args.workers, args.api_url, args.wikidata_api_url
+            )
+        else:
+            get_news_website_links_from_all_countries(csvfile, args.workers)
 
         end_time = time.time()  # End timer
         elapsed_time = end_time - start_time
         print_log(
             f"Export completed! Total time taken: {elapsed_time:.2f} seconds."
         )  # Clear line after overwriting
+        http_transport.report_stats(print_log)
     except Exception as e:
         print_error(f"An error occurred: {e}")
     finally: